@@ -1,7 +1,8 @@
-from .main import main, convert_file, AtCoderProblemParser
+from .main import main, convert_file, convert_batch, AtCoderProblemParser
 
 __all__ = [
     "main",
     "convert_file",
+    "convert_batch",
     "AtCoderProblemParser",
 ]
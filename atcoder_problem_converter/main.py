@@ -1,35 +1,97 @@
 #!/usr/bin/env python3
 """AtCoder Problem HTML to Markdown Converter package module."""
 
+import hashlib
+import io
+import multiprocessing
 import re
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict
-from bs4 import BeautifulSoup, Tag
+from typing import Optional, Dict, List, Tuple, Union
+from bs4 import BeautifulSoup, FeatureNotFound, Tag
+
+_LIMITS_JA_RE = re.compile(r'実行時間制限[：:]\s*(\d+(?:\.\d+)?\s*sec).*メモリ制限[：:]\s*(\d+\s*\w+)')
+_LIMITS_EN_RE = re.compile(r'Time\s+Limit[：:]\s*(\d+(?:\.\d+)?\s*sec).*Memory\s+Limit[：:]\s*(\d+\s*\w+)')
+_VAR_SUB_RE = re.compile(r'_(\w+)')
+_URL_RE = re.compile(r'^https?://')
+
+# Inline tags rendered directly from their (stripped) text content.
+_TAG_FMT = {
+    'var': lambda t: '$' + _VAR_SUB_RE.sub(r'_{\1}', t) + '$',
+    'code': lambda t: '`' + t + '`',
+    'strong': lambda t: '**' + t + '**',
+    'em': lambda t: '*' + t + '*',
+}
+# Nested lists are rendered separately by _parse_list_items.
+_SKIP_TAGS = frozenset(('ul', 'ol'))
+
+
+def _has_limits_label(text: Optional[str]) -> bool:
+    # Plain substring checks; most paragraphs never reach the regexes.
+    return text is not None and ('Time Limit' in text or '実行時間制限' in text)
+
+
+def _limits_patterns(language: str) -> Tuple[re.Pattern, re.Pattern]:
+    # The page's own language is tried first; the other is a fallback.
+    if language == 'en':
+        return (_LIMITS_EN_RE, _LIMITS_JA_RE)
+    return (_LIMITS_JA_RE, _LIMITS_EN_RE)
+
+
+def _match_limits(text: str, patterns: Tuple[re.Pattern, ...]) -> Optional[Dict[str, str]]:
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return {'time': match.group(1), 'memory': match.group(2)}
+    return None
 
 
 class AtCoderProblemParser:
-    def __init__(self, html_content: str, language: str = 'ja'):
-        self.soup = BeautifulSoup(html_content, 'html.parser')
-        self.markdown_content = []
+    __slots__ = ('soup', 'language', '_buf', '_section_handlers', '_lang_class', '_limits_res')
+
+    def __init__(self, html_content: Union[str, bytes], language: str = 'ja',
+                 encoding: Optional[str] = None):
+        self._buf = io.StringIO()
         self.language = language
+        self._lang_class = f'lang-{language}'
+        self._limits_res = _limits_patterns(language)
+        self._section_handlers = {
+            'h3': self._emit_h3,
+            'p': self._emit_p,
+            'ul': self._emit_ul,
+            'ol': self._emit_ul,
+            'pre': self._emit_pre,
+            'div': self._parse_section,
+        }
+        try:
+            self.soup = BeautifulSoup(html_content, 'lxml', from_encoding=encoding)
+        except FeatureNotFound:  # pragma: no cover - lxml not installed
+            self.soup = BeautifulSoup(html_content, 'html.parser', from_encoding=encoding)
+
+    def _emit(self, line: str) -> None:
+        self._buf.write(line)
+        self._buf.write('\n')
 
     def parse(self) -> str:
         title = self._extract_title()
         if title:
-            self.markdown_content.append(f"# {title}\n")
+            self._emit(f"# {title}\n")
         limits = self._extract_limits()
         if limits:
-            self.markdown_content.append(f"**Time Limit:** {limits['time']}")
-            self.markdown_content.append(f"**Memory Limit:** {limits['memory']}\n")
+            self._emit(f"**Time Limit:** {limits['time']}")
+            self._emit(f"**Memory Limit:** {limits['memory']}\n")
         task_statement = self.soup.find('div', id='task-statement')
         if task_statement:
-            lang_content = task_statement.find('span', class_=f'lang-{self.language}')
+            lang_content = task_statement.find('span', class_=self._lang_class)
             if lang_content:
                 self._parse_problem_content(lang_content)
             else:
                 self._parse_problem_content(task_statement)
-        return '\n'.join(self.markdown_content)
+        # Every line is newline-terminated; drop the final one to match join().
+        return self._buf.getvalue()[:-1]
 
     def _extract_title(self) -> Optional[str]:
         title_tag = self.soup.find('title')
@@ -41,57 +103,68 @@ class AtCoderProblemParser:
         return None
 
     def _extract_limits(self) -> Optional[Dict[str, str]]:
-        limits_p = self.soup.find('p', string=re.compile(r'実行時間制限|Time Limit'))
+        limits_p = self.soup.find('p', string=_has_limits_label)
         if limits_p and limits_p.text:
-            match = re.search(r'実行時間制限[：:]\s*(\d+(?:\.\d+)?\s*sec).*メモリ制限[：:]\s*(\d+\s*\w+)', limits_p.text)
-            if not match:
-                match = re.search(r'Time\s+Limit[：:]\s*(\d+(?:\.\d+)?\s*sec).*Memory\s+Limit[：:]\s*(\d+\s*\w+)', limits_p.text)
-            if match:
-                return {'time': match.group(1), 'memory': match.group(2)}
+            return _match_limits(limits_p.text, self._limits_res)
         return None
 
     def _parse_problem_content(self, content_tag: Tag):
-        sections = content_tag.find_all('section')
-        if sections:
-            for section in sections:
-                self._parse_section(section)
-        else:
+        # Sections usually sit inside wrapper divs, so walk all descendants
+        # lazily rather than materialising them with find_all().
+        found = False
+        for node in content_tag.descendants:
+            if node.name == 'section':
+                found = True
+                self._parse_section(node)
+        if not found:
             self._parse_section(content_tag)
 
     def _parse_section(self, section_tag: Tag):
-        elements = [child for child in section_tag.children if isinstance(child, Tag)]
-        index = 0
-        while index < len(elements):
-            element = elements[index]
-            if element.name == 'h3':
-                self.markdown_content.append(f"\n## {element.text.strip()}\n")
-            elif element.name == 'p':
-                if '配点' in element.text or 'Score' in element.text:
-                    self.markdown_content.append(f"\n**{element.text.strip()}**\n")
-                else:
-                    text = self._convert_text_with_variables(element)
-                    if text:
-                        self.markdown_content.append(text)
-            elif element.name in ('ul', 'ol'):
-                self._parse_list(element)
-                self.markdown_content.append("")
-            elif element.name == 'li':
-                li_items = []
-                while index < len(elements) and elements[index].name == 'li':
-                    li_items.append(elements[index])
-                    index += 1
-                self._parse_list_items(li_items, indent_level=0, ordered=False, start=1)
-                self.markdown_content.append("")
+        handlers = self._section_handlers
+        in_li_run = False
+        for element in section_tag.children:
+            if not isinstance(element, Tag):
+                continue
+            name = element.name
+            if name == 'li':
+                # Bare <li> runs are rendered as one unordered list.
+                self._emit_li(element)
+                in_li_run = True
                 continue
-            elif element.name == 'pre':
-                code_text = element.text.strip()
-                if code_text:
-                    self.markdown_content.append("```")
-                    self.markdown_content.append(code_text)
-                    self.markdown_content.append("```\n")
-            elif element.name == 'div':
-                self._parse_section(element)
-            index += 1
+            if in_li_run:
+                self._emit("")
+                in_li_run = False
+            handler = handlers.get(name)
+            if handler is not None:
+                handler(element)
+        if in_li_run:
+            self._emit("")
+
+    def _emit_h3(self, element: Tag) -> None:
+        self._emit(f"\n## {element.get_text().strip()}\n")
+
+    def _emit_p(self, element: Tag) -> None:
+        txt = element.get_text()
+        if '配点' in txt or 'Score' in txt:
+            self._emit(f"\n**{txt.strip()}**\n")
+        else:
+            text = self._convert_text_with_variables(element)
+            if text:
+                self._emit(text)
+
+    def _emit_ul(self, element: Tag) -> None:
+        self._parse_list(element)
+        self._emit("")
+
+    def _emit_li(self, element: Tag) -> None:
+        self._parse_list_items([element], indent_level=0, ordered=False, start=1)
+
+    def _emit_pre(self, element: Tag) -> None:
+        code_text = element.get_text().strip()
+        if code_text:
+            self._emit("```")
+            self._emit(code_text)
+            self._emit("```\n")
 
     def _parse_list(self, list_tag: Tag, indent_level: int = 0):
         ordered = list_tag.name == 'ol'
@@ -101,7 +174,7 @@ class AtCoderProblemParser:
                 start = int(list_tag['start'])
             except ValueError:
                 start = 1
-        items = list_tag.find_all('li', recursive=False)
+        items = [child for child in list_tag.children if isinstance(child, Tag) and child.name == 'li']
         self._parse_list_items(items, indent_level=indent_level, ordered=ordered, start=start)
 
     def _parse_list_items(self, items, indent_level: int, ordered: bool, start: int):
@@ -117,9 +190,9 @@ class AtCoderProblemParser:
             marker = f"{marker_number}." if ordered else "-"
             li_text = self._convert_text_with_variables(li)
             if li_text:
-                self.markdown_content.append(f"{indent}{marker} {li_text}")
+                self._emit(f"{indent}{marker} {li_text}")
             else:
-                self.markdown_content.append(f"{indent}{marker}")
+                self._emit(f"{indent}{marker}")
             for child in li.children:
                 if isinstance(child, Tag) and child.name in ('ul', 'ol'):
                     self._parse_list(child, indent_level + 1)
@@ -133,25 +206,56 @@ class AtCoderProblemParser:
                     index += 1
 
     def _convert_text_with_variables(self, element: Tag) -> str:
-        text_parts = []
-        for child in element.children:
-            if isinstance(child, str):
-                text_parts.append(child)
-            elif child.name == 'var':
-                var_text = child.text.strip()
-                var_text = re.sub(r'_(\w+)', r'_{\1}', var_text)
-                text_parts.append(f"${var_text}$")
-            elif child.name == 'code':
-                text_parts.append(f"`{child.text.strip()}`")
-            elif child.name in ['ul', 'ol']:
-                continue
-            elif child.name == 'strong':
-                text_parts.append(f"**{child.text.strip()}**")
-            elif child.name == 'em':
-                text_parts.append(f"*{child.text.strip()}*")
+        # Iterative walk; each stack frame holds the children still to visit
+        # and the parts collected so far, so a nested tag's text is stripped
+        # on its own before being added to its parent.
+        stack = [(iter(element.children), [])]
+        while True:
+            children, parts = stack[-1]
+            for child in children:
+                if isinstance(child, str):
+                    parts.append(child)
+                    continue
+                name = child.name
+                fmt = _TAG_FMT.get(name)
+                if fmt is not None:
+                    parts.append(fmt(child.get_text().strip()))
+                elif name not in _SKIP_TAGS:
+                    stack.append((iter(child.children), []))
+                    break
             else:
-                text_parts.append(self._convert_text_with_variables(child))
-        return ''.join(text_parts).strip()
+                stack.pop()
+                text = ''.join(parts).strip()
+                if not stack:
+                    return text
+                stack[-1][1].append(text)
+
+
+# Converted markdown keyed by (content digest, language, encoding), most
+# recent last. The cache lives in this process only: it pays off when one
+# process converts the same page more than once (e.g. the URL threads of a
+# batch run), not across separate CLI runs or multiprocessing workers.
+_PARSE_CACHE: 'OrderedDict[Tuple[bytes, str, Optional[str]], str]' = OrderedDict()
+_PARSE_CACHE_SIZE = 128
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def _parse_cached(html_bytes: bytes, language: str, encoding: Optional[str] = None) -> str:
+    # Only raw bytes are accepted: str input skips charset sniffing and can
+    # render differently, so it must never share an entry with bytes.
+    key = (hashlib.blake2b(html_bytes, digest_size=16).digest(), language, encoding)
+    with _PARSE_CACHE_LOCK:
+        markdown_content = _PARSE_CACHE.get(key)
+        if markdown_content is not None:
+            _PARSE_CACHE.move_to_end(key)
+            return markdown_content
+    # Parse outside the lock so concurrent conversions are not serialised.
+    markdown_content = AtCoderProblemParser(html_bytes, language, encoding).parse()
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = markdown_content
+        if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+    return markdown_content
 
 
 def convert_file(input_path: str, output_path: Optional[str] = None, language: str = 'ja') -> None:
@@ -164,16 +268,16 @@ def convert_file(input_path: str, output_path: Optional[str] = None, language: s
     if not input_file.exists():
         print(f"Error: File '{input_path}' not found", file=sys.stderr)
         sys.exit(1)
-    html_content = input_file.read_text(encoding='utf-8')
-    parser = AtCoderProblemParser(html_content, language)
-    markdown_content = parser.parse()
+    # Local files are UTF-8; pass the raw bytes so they are hashed as read.
+    html_content = input_file.read_bytes()
+    markdown_content = _parse_cached(html_content, language, 'utf-8')
     if output_path is None or output_path == '-':  # stdout mode
         if not markdown_content.endswith('\n'):
             markdown_content += '\n'
         sys.stdout.write(markdown_content)
         return
     output_file = Path(output_path)
-    output_file.write_text(markdown_content, encoding='utf-8')
+    output_file.write_bytes(markdown_content.encode('utf-8'))
     print(f"Successfully converted '{input_path}' to '{output_file}'")
     print(f"Language: {language}")
 
@@ -188,6 +292,27 @@ def _default_output_from_url(url: str) -> Path:
     return Path(tail)
 
 
+# Shared HTTP session so batch fetches reuse pooled keep-alive connections.
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session():
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests  # type: ignore
+            from requests.adapters import HTTPAdapter  # type: ignore
+            session = requests.Session()
+            session.headers.update({
+                'Accept-Encoding': 'gzip, deflate',
+                'User-Agent': 'atcoder-problem-converter',
+            })
+            session.mount('https://', HTTPAdapter(pool_maxsize=32))
+            _SESSION = session
+        return _SESSION
+
+
 def convert_url(url: str, output_path: Optional[str] = None, language: str = 'ja') -> None:
     """Fetch an AtCoder problem page via HTTP(S) and convert it to Markdown.
 
@@ -201,46 +326,170 @@ def convert_url(url: str, output_path: Optional[str] = None, language: str = 'ja
         'ja' or 'en'
     """
     try:
-        import requests  # type: ignore
+        session = _get_session()
     except ImportError:  # pragma: no cover - defensive
         print("Error: 'requests' package is required for URL input. Please install dependencies.", file=sys.stderr)
         sys.exit(1)
 
     try:
-        resp = requests.get(url, timeout=10)
+        resp = session.get(url, timeout=10)
     except Exception as e:  # pragma: no cover - network failure path
         print(f"Error: Failed to fetch URL: {e}", file=sys.stderr)
         sys.exit(1)
     if resp.status_code != 200:
         print(f"Error: HTTP {resp.status_code} when fetching URL", file=sys.stderr)
         sys.exit(1)
-    html_content = resp.text
-    parser = AtCoderProblemParser(html_content, language)
-    markdown_content = parser.parse()
+    # Hand the raw bytes to the parser; it sniffs the encoding itself.
+    html_content = resp.content
+    markdown_content = _parse_cached(html_content, language)
     if output_path is None or output_path == '-':  # stdout mode
         if not markdown_content.endswith('\n'):
             markdown_content += '\n'
         sys.stdout.write(markdown_content)
         return
     output_file = Path(output_path)
-    output_file.write_text(markdown_content, encoding='utf-8')
+    output_file.write_bytes(markdown_content.encode('utf-8'))
     print(f"Successfully converted '{url}' to '{output_file}'")
     print(f"Language: {language}")
 
 
+def _read_batch_entries(source: str) -> List[str]:
+    if source.startswith('@'):
+        list_file = Path(source[1:])
+        if not list_file.exists():
+            print(f"Error: File '{list_file}' not found", file=sys.stderr)
+            sys.exit(1)
+        lines = list_file.read_text(encoding='utf-8').splitlines()
+        return [line.strip() for line in lines if line.strip()]
+    directory = Path(source)
+    if not directory.is_dir():
+        print(f"Error: Directory '{source}' not found", file=sys.stderr)
+        sys.exit(1)
+    return [str(path) for path in sorted(directory.glob('*.html'))]
+
+
+def _batch_convert_file(input_path: str, output_path: str, language: str) -> Optional[str]:
+    """Pool worker for convert_batch; returns an error message instead of exiting.
+
+    convert_file reports errors with sys.exit, and a SystemExit escaping a
+    multiprocessing worker kills it and leaves the pool's result pending.
+    """
+    try:
+        convert_file(input_path, output_path, language)
+    except SystemExit:
+        return f"failed to convert '{input_path}'"
+    except Exception as e:
+        return f"failed to convert '{input_path}': {e}"
+    return None
+
+
+def _batch_convert_url(url: str, output_path: str, language: str) -> Optional[str]:
+    try:
+        convert_url(url, output_path, language)
+    except SystemExit:
+        return f"failed to convert '{url}'"
+    except Exception as e:
+        return f"failed to convert '{url}': {e}"
+    return None
+
+
+def convert_batch(source: str, output_dir: Optional[str] = None, language: str = 'ja',
+                  jobs: Optional[int] = None) -> None:
+    """Convert many problems in parallel.
+
+    ``source`` is either a directory (every ``*.html`` file in it is converted)
+    or ``@list.txt``, a file listing one HTML path or URL per line. Each result
+    is written as ``<name>.md`` into output_dir, or, when omitted or '-', next
+    to the HTML file (local input) or into the current directory (URLs).
+
+    Local files are converted in a process pool since parsing is CPU-bound;
+    URLs are fetched in a thread pool running alongside it. Every entry is
+    attempted; missing inputs, entries whose output name is already taken by
+    an earlier entry, and failed conversions are listed on stderr and the
+    process exits with status 1.
+    """
+    entries = _read_batch_entries(source)
+    # '-' means stdout for a single file; in batch mode treat it as omitted.
+    out_dir = Path(output_dir) if output_dir and output_dir != '-' else None
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    errors = []
+    file_tasks = []
+    url_tasks = []
+    targets = {}
+    for entry in entries:
+        is_url = _URL_RE.match(entry)
+        if is_url:
+            output_file = _default_output_from_url(entry)
+            if out_dir is not None:
+                output_file = out_dir / output_file
+        else:
+            input_file = Path(entry)
+            if not input_file.exists():
+                errors.append(f"file '{entry}' not found")
+                continue
+            output_file = input_file.with_suffix('.md')
+            if out_dir is not None:
+                output_file = out_dir / output_file.name
+        target = output_file.resolve()
+        if target in targets:
+            errors.append(f"'{entry}' would overwrite '{output_file}' from '{targets[target]}'")
+            continue
+        targets[target] = entry
+        if is_url:
+            url_tasks.append((entry, str(output_file), language))
+        else:
+            file_tasks.append((entry, str(output_file), language))
+
+    pool = multiprocessing.Pool(jobs) if file_tasks else None
+    try:
+        pending = pool.starmap_async(_batch_convert_file, file_tasks, chunksize=4) if pool else None
+        if url_tasks:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                errors.extend(executor.map(lambda task: _batch_convert_url(*task), url_tasks))
+        if pending is not None:
+            errors.extend(pending.get())
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    errors = [error for error in errors if error is not None]
+    if errors:
+        for error in errors:
+            print(f"Error: {error}", file=sys.stderr)
+        print(f"Error: {len(errors)} of {len(entries)} conversions failed", file=sys.stderr)
+        sys.exit(1)
+
+
+def _positive_int(value: str) -> int:
+    import argparse
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(
         description='Convert AtCoder problem HTML to Markdown format',
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog='''\nExamples:\n  uv run apc problem.html            # write markdown to stdout\n  uv run apc problem.html output.md  # write to output.md\n  uv run apc problem.html -          # explicit stdout\n  uv run apc problem.html -l en      # stdout, English\n'''
+        epilog='''\nExamples:\n  uv run apc problem.html            # write markdown to stdout\n  uv run apc problem.html output.md  # write to output.md\n  uv run apc problem.html -          # explicit stdout\n  uv run apc problem.html -l en      # stdout, English\n  uv run apc --batch problems/ out/  # convert every problems/*.html into out/\n  uv run apc --batch @urls.txt       # convert each path/URL listed in urls.txt\n'''
     )
     parser.add_argument('input_html', help='Path to the input HTML file or an AtCoder problem URL')
     parser.add_argument('output_md', nargs='?', help="Path to the output Markdown file (optional). Use '-' or omit to write to stdout")
     parser.add_argument('-l', '--language', default='ja', choices=['ja', 'en'], help='Language to extract (default: ja)')
+    parser.add_argument('--batch', action='store_true', help="Treat input as a directory of HTML files or '@list.txt'; output_md is then the output directory")
+    parser.add_argument('-j', '--jobs', type=_positive_int, default=None, help='Number of parallel workers in batch mode (default: CPU count)')
     args = parser.parse_args()
+    if args.batch or args.input_html.startswith('@') or Path(args.input_html).is_dir():
+        convert_batch(args.input_html, args.output_md, args.language, args.jobs)
     # Detect URL (http/https)
-    if re.match(r'^https?://', args.input_html):
+    elif _URL_RE.match(args.input_html):
         convert_url(args.input_html, args.output_md, args.language)
     else:
         convert_file(args.input_html, args.output_md, args.language)
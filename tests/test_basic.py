@@ -1,9 +1,13 @@
 from atcoder_problem_converter import AtCoderProblemParser
-from atcoder_problem_converter.main import convert_file
+from atcoder_problem_converter.main import convert_batch, convert_file, _batch_convert_file
 from pathlib import Path
 from io import StringIO
+from collections import OrderedDict
+import importlib
 import sys
 
+import pytest
+
 SAMPLE_HTML = """
 <html>
 <head><title>ABC001 A - 積雪深差</title></head>
@@ -39,6 +43,24 @@ def test_parse_basic():
     assert '$a$' in md and '$b$' in md
 
 
+def test_parse_cached_reuses_result(monkeypatch):
+    module = importlib.import_module('atcoder_problem_converter.main')
+    monkeypatch.setattr(module, '_PARSE_CACHE', OrderedDict())
+    html = SAMPLE_HTML.encode('utf-8')
+    first = module._parse_cached(html, 'ja')
+    monkeypatch.setattr(module, 'AtCoderProblemParser', None)  # must not be constructed again
+    assert module._parse_cached(html, 'ja') == first
+
+
+def test_convert_file_reads_utf8_bytes(tmp_path: Path, monkeypatch):
+    html_file = tmp_path / 'prob.html'
+    html_file.write_text('<title>ÄÖÜ café</title>', encoding='utf-8')
+    buf = StringIO()
+    monkeypatch.setattr(sys, 'stdout', buf)
+    convert_file(str(html_file), None, language='ja')
+    assert buf.getvalue() == '# ÄÖÜ café\n'
+
+
 def test_convert_file_stdout(tmp_path: Path, monkeypatch):
   html_file = tmp_path / 'prob.html'
   html_file.write_text(SAMPLE_HTML, encoding='utf-8')
@@ -52,3 +74,63 @@ def test_convert_file_stdout(tmp_path: Path, monkeypatch):
   convert_file(str(html_file), '-', language='ja')  # explicit -
   out2 = buf2.getvalue()
   assert '# ABC001 A - 積雪深差' in out2
+
+
+def test_convert_batch_directory(tmp_path: Path):
+  src = tmp_path / 'html'
+  src.mkdir()
+  for name in ('a', 'b', 'c'):
+    (src / f'{name}.html').write_text(SAMPLE_HTML, encoding='utf-8')
+  out = tmp_path / 'md'
+  convert_batch(str(src), str(out), language='ja', jobs=2)
+  for name in ('a', 'b', 'c'):
+    assert '# ABC001 A - 積雪深差' in (out / f'{name}.md').read_text(encoding='utf-8')
+  # list file input, writing next to each HTML file
+  list_file = tmp_path / 'list.txt'
+  list_file.write_text(f"{src / 'a.html'}\n\n{src / 'b.html'}\n", encoding='utf-8')
+  convert_batch('@' + str(list_file), None, language='ja', jobs=1)
+  assert (src / 'a.md').exists() and (src / 'b.md').exists()
+  assert not (src / 'c.md').exists()
+
+
+def test_convert_batch_reports_failures(tmp_path: Path, capsys):
+  src = tmp_path / 'html'
+  src.mkdir()
+  (src / 'a.html').write_text(SAMPLE_HTML, encoding='utf-8')
+  (src / 'broken.html').mkdir()  # matches *.html but cannot be read
+  out = tmp_path / 'md'
+  with pytest.raises(SystemExit) as exc:
+    convert_batch(str(src), str(out), language='ja', jobs=2)
+  assert exc.value.code == 1
+  assert (out / 'a.md').exists()
+  assert '1 of 2 conversions failed' in capsys.readouterr().err
+
+
+def test_batch_worker_returns_error_instead_of_exiting(tmp_path: Path):
+  # e.g. an input deleted between the directory scan and the worker's read
+  error = _batch_convert_file(str(tmp_path / 'gone.html'), str(tmp_path / 'gone.md'), 'ja')
+  assert error is not None and 'gone.html' in error
+
+
+def test_convert_batch_list_missing_and_colliding_entries(tmp_path: Path, capsys, monkeypatch):
+  for sub in ('a', 'b'):
+    (tmp_path / sub).mkdir()
+    (tmp_path / sub / 'p.html').write_text(SAMPLE_HTML.replace('積雪深差', sub), encoding='utf-8')
+  list_file = tmp_path / 'list.txt'
+  list_file.write_text(
+    f"{tmp_path / 'missing.html'}\n{tmp_path / 'a' / 'p.html'}\n{tmp_path / 'b' / 'p.html'}\n",
+    encoding='utf-8',
+  )
+  out = tmp_path / 'md'
+  with pytest.raises(SystemExit):
+    convert_batch('@' + str(list_file), str(out), language='ja', jobs=1)
+  err = capsys.readouterr().err
+  assert 'missing.html' in err and 'would overwrite' in err
+  assert '2 of 3 conversions failed' in err
+  # the first claimant of out/p.md is still converted and not overwritten
+  assert 'ABC001 A - a' in (out / 'p.md').read_text(encoding='utf-8')
+  # '-' as the output directory means "next to each input"
+  monkeypatch.chdir(tmp_path)
+  convert_batch(str(tmp_path / 'a'), '-', language='ja', jobs=1)
+  assert (tmp_path / 'a' / 'p.md').exists()
+  assert not (tmp_path / '-').exists()
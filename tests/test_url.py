@@ -1,7 +1,7 @@
 from unittest.mock import patch, Mock
 from pathlib import Path
 
-from atcoder_problem_converter.main import convert_url
+from atcoder_problem_converter.main import convert_batch, convert_url
 
 SAMPLE_HTML = """
 <html>
@@ -23,9 +23,9 @@ SAMPLE_HTML = """
 def test_convert_url_basic(tmp_path: Path):
   m = Mock()
   m.status_code = 200
-  m.text = SAMPLE_HTML
-  # requests is imported inside convert_url, so we patch the top-level 'requests.get'
-  with patch('requests.get', return_value=m) as get_mock:
+  m.content = SAMPLE_HTML.encode('utf-8')
+  # convert_url fetches through a shared requests.Session, so patch Session.get
+  with patch('requests.Session.get', return_value=m) as get_mock:
     out_file = tmp_path / 'output.md'
     convert_url('https://atcoder.jp/contests/abc419/tasks/abc419_e', str(out_file), language='en')
     assert out_file.exists()
@@ -33,3 +33,22 @@ def test_convert_url_basic(tmp_path: Path):
     assert '# ABC419 E - Sample Title' in content
     assert '$x_{1}$' in content  # variable formatting
     get_mock.assert_called_once()
+
+
+def test_convert_batch_url_list(tmp_path: Path):
+  m = Mock()
+  m.status_code = 200
+  m.content = SAMPLE_HTML.encode('utf-8')
+  list_file = tmp_path / 'urls.txt'
+  list_file.write_text(
+    'https://atcoder.jp/contests/abc419/tasks/abc419_e\n'
+    'https://atcoder.jp/contests/abc419/tasks/abc419_f\n',
+    encoding='utf-8',
+  )
+  out = tmp_path / 'md'
+  with patch('requests.Session.get', return_value=m) as get_mock:
+    convert_batch('@' + str(list_file), str(out), language='en', jobs=2)
+  assert get_mock.call_count == 2
+  for name in ('abc419_e', 'abc419_f'):
+    content = (out / f'{name}.md').read_text(encoding='utf-8')
+    assert '# ABC419 E - Sample Title' in content